@@ -8,9 +8,7 @@ from examples.utils import read_test_data
 class MonthlyReturn(BaseIndicator):
     """Monthly return indicator"""
 
-    @property
-    def name(self) -> str:
-        return "monthly_return"
+    name = "monthly_return"
 
     @property
     def requires(self) -> Set[str]:
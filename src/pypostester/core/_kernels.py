@@ -0,0 +1,27 @@
+"""Kernels for the backtesting hot paths
+
+The Numba kernels are used when Numba can be imported; otherwise the
+vectorized NumPy implementations with the same interface are used.
+"""
+
+try:
+    from pypostester.core._numba_kernels import (
+        drawdown_stats,
+        funding_curve_kernel_fee,
+        funding_curve_kernel_free,
+        return_stats,
+    )
+except ImportError:
+    from pypostester.core._numpy_kernels import (
+        drawdown_stats,
+        funding_curve_kernel_fee,
+        funding_curve_kernel_free,
+        return_stats,
+    )
+
+__all__ = [
+    "drawdown_stats",
+    "funding_curve_kernel_fee",
+    "funding_curve_kernel_free",
+    "return_stats",
+]
@@ -0,0 +1,208 @@
+"""Numba kernels for the backtesting hot paths"""
+
+from typing import Tuple
+import numba
+import numpy as np
+from numba import types
+
+# Explicit signatures compile the kernels eagerly at import; together with
+# cache=True the machine code is persisted on disk and reused by later
+# processes. Input buffers come from Polars and are read-only views; null
+# values arrive as NaN. The NumPy error model makes division by zero yield
+# inf/NaN like the NumPy fallback instead of raising.
+_f8_in = types.Array(types.float64, 1, "C", readonly=True)
+_f8_out = types.float64[::1]
+
+
+@numba.njit(
+    types.void(_f8_in, _f8_in, types.float64, _f8_out, _f8_out),
+    cache=True,
+    nogil=True,
+    error_model="numpy",
+)
+def funding_curve_kernel_fee(
+    close: np.ndarray,
+    pos: np.ndarray,
+    commission: float,
+    out_curve: np.ndarray,
+    out_ret: np.ndarray,
+) -> None:
+    """Calculate funding curve and net returns with transaction costs
+
+    Args:
+        close: Close prices
+        pos: Positions aligned with close prices
+        commission: Commission rate charged on position changes
+        out_curve: Preallocated output array for the funding curve
+        out_ret: Preallocated output array for the net returns
+    """
+    n = close.shape[0]
+    if n == 0:
+        return
+
+    acc = 1.0
+    out_curve[0] = acc
+    out_ret[0] = 0.0
+    for i in range(1, n):
+        # Missing returns, positions and position changes count as zero
+        r = close[i] / close[i - 1] - 1.0
+        if np.isnan(r):
+            r = 0.0
+        prev_pos = pos[i - 1]
+        if np.isnan(prev_pos):
+            prev_pos = 0.0
+        change = abs(pos[i] - pos[i - 1])
+        if np.isnan(change):
+            change = 0.0
+        net = r * prev_pos - change * commission
+        acc *= 1.0 + net
+        out_curve[i] = acc
+        out_ret[i] = net
+
+
+@numba.njit(
+    types.void(_f8_in, _f8_in, _f8_out, _f8_out),
+    cache=True,
+    nogil=True,
+    error_model="numpy",
+)
+def funding_curve_kernel_free(
+    close: np.ndarray,
+    pos: np.ndarray,
+    out_curve: np.ndarray,
+    out_ret: np.ndarray,
+) -> None:
+    """Calculate funding curve and net returns without transaction costs
+
+    Args:
+        close: Close prices
+        pos: Positions aligned with close prices
+        out_curve: Preallocated output array for the funding curve
+        out_ret: Preallocated output array for the net returns
+    """
+    n = close.shape[0]
+    if n == 0:
+        return
+
+    acc = 1.0
+    out_curve[0] = acc
+    out_ret[0] = 0.0
+    for i in range(1, n):
+        # Missing returns and positions count as zero
+        r = close[i] / close[i - 1] - 1.0
+        if np.isnan(r):
+            r = 0.0
+        prev_pos = pos[i - 1]
+        if np.isnan(prev_pos):
+            prev_pos = 0.0
+        net = r * prev_pos
+        acc *= 1.0 + net
+        out_curve[i] = acc
+        out_ret[i] = net
+
+
+@numba.njit(
+    types.Tuple((types.float64, types.int64, types.int64, types.float64))(_f8_in),
+    cache=True,
+    nogil=True,
+    error_model="numpy",
+)
+def drawdown_stats(curve: np.ndarray) -> Tuple[float, int, int, float]:
+    """Calculate drawdown statistics in a single pass
+
+    Args:
+        curve: Funding curve values
+
+    Returns:
+        Tuple of (maximum drawdown, peak index, trough index,
+        average of non-zero drawdowns)
+    """
+    n = curve.shape[0]
+    best_dd = 0.0
+    best_start = 0
+    best_end = 0
+    dd_sum = 0.0
+    dd_comp = 0.0
+    dd_count = 0
+    if n == 0:
+        return best_dd, best_start, best_end, 0.0
+
+    running_max = curve[0]
+    running_max_idx = 0
+    for i in range(n):
+        value = curve[i]
+        if value >= running_max:
+            running_max = value
+            running_max_idx = i
+        dd = (running_max - value) / running_max
+        if dd > 0:
+            # Kahan summation keeps the average accurate on long curves;
+            # this kernel must not be compiled with fastmath
+            y = dd - dd_comp
+            t = dd_sum + y
+            dd_comp = (t - dd_sum) - y
+            dd_sum = t
+            dd_count += 1
+            if dd > best_dd:
+                best_dd = dd
+                best_start = running_max_idx
+                best_end = i
+
+    avg_dd = dd_sum / dd_count if dd_count > 0 else 0.0
+    return best_dd, best_start, best_end, avg_dd
+
+
+@numba.njit(
+    types.Tuple(
+        (
+            types.float64,
+            types.int64,
+            types.float64,
+            types.int64,
+            types.float64,
+            types.int64,
+        )
+    )(_f8_in),
+    cache=True,
+    nogil=True,
+    error_model="numpy",
+)
+def return_stats(
+    returns: np.ndarray,
+) -> Tuple[float, int, float, int, float, int]:
+    """Calculate summary statistics of returns in a single pass
+
+    The variance is accumulated with Welford's algorithm for numerical
+    stability. The standard deviation uses one degree of freedom.
+
+    Args:
+        returns: Period returns
+
+    Returns:
+        Tuple of (standard deviation, number of positive returns, mean of
+        positive returns, number of negative returns, mean of negative
+        returns, number of returns)
+    """
+    n = returns.shape[0]
+    mean = 0.0
+    m2 = 0.0
+    neg_n = 0
+    neg_sum = 0.0
+    wins = 0
+    win_sum = 0.0
+    for i in range(n):
+        r = returns[i]
+        delta = r - mean
+        mean += delta / (i + 1)
+        m2 += delta * (r - mean)
+        # Branchless count so the comparison compiles to a mask add
+        wins += r > 0
+        win_sum += max(r, 0.0)
+        if r < 0:
+            neg_n += 1
+            neg_sum += r
+
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+    win_mean = win_sum / wins if wins > 0 else 0.0
+    neg_mean = neg_sum / neg_n if neg_n > 0 else 0.0
+    return std, wins, win_mean, neg_n, neg_mean, n
@@ -0,0 +1,148 @@
+"""NumPy fallbacks for the backtesting kernels when Numba is unavailable"""
+
+from typing import Tuple
+import numpy as np
+
+
+def funding_curve_kernel_fee(
+    close: np.ndarray,
+    pos: np.ndarray,
+    commission: float,
+    out_curve: np.ndarray,
+    out_ret: np.ndarray,
+) -> None:
+    """Calculate funding curve and net returns with transaction costs
+
+    Args:
+        close: Close prices
+        pos: Positions aligned with close prices
+        commission: Commission rate charged on position changes
+        out_curve: Preallocated output array for the funding curve
+        out_ret: Preallocated output array for the net returns
+    """
+    if close.shape[0] == 0:
+        return
+
+    out_ret[0] = 0.0
+    net = out_ret[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        _price_returns(close, net)
+        net *= _zero_missing(pos[:-1])
+        net -= _zero_missing(np.abs(np.diff(pos))) * commission
+        _compound(net, out_curve)
+
+
+def funding_curve_kernel_free(
+    close: np.ndarray,
+    pos: np.ndarray,
+    out_curve: np.ndarray,
+    out_ret: np.ndarray,
+) -> None:
+    """Calculate funding curve and net returns without transaction costs
+
+    Args:
+        close: Close prices
+        pos: Positions aligned with close prices
+        out_curve: Preallocated output array for the funding curve
+        out_ret: Preallocated output array for the net returns
+    """
+    if close.shape[0] == 0:
+        return
+
+    out_ret[0] = 0.0
+    net = out_ret[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        _price_returns(close, net)
+        net *= _zero_missing(pos[:-1])
+        _compound(net, out_curve)
+
+
+def _price_returns(close: np.ndarray, out: np.ndarray) -> None:
+    """Calculate price returns, counting missing returns as zero
+
+    Args:
+        close: Close prices
+        out: Preallocated output array for the returns from the second period
+    """
+    np.divide(close[1:], close[:-1], out=out)
+    out -= 1.0
+    np.copyto(out, 0.0, where=np.isnan(out))
+
+
+def _zero_missing(values: np.ndarray) -> np.ndarray:
+    """Replace NaN values, which is how nulls arrive, with zero
+
+    Args:
+        values: Input values
+
+    Returns:
+        Array with NaN values replaced by zero
+    """
+    return np.where(np.isnan(values), 0.0, values)
+
+
+def _compound(net: np.ndarray, out_curve: np.ndarray) -> None:
+    """Compound net returns into a funding curve starting at 1
+
+    Args:
+        net: Net returns from the second period onwards
+        out_curve: Preallocated output array for the funding curve
+    """
+    out_curve[0] = 1.0
+    np.add(net, 1.0, out=out_curve[1:])
+    np.multiply.accumulate(out_curve[1:], out=out_curve[1:])
+
+
+def drawdown_stats(curve: np.ndarray) -> Tuple[float, int, int, float]:
+    """Calculate drawdown statistics
+
+    Args:
+        curve: Funding curve values
+
+    Returns:
+        Tuple of (maximum drawdown, peak index, trough index,
+        average of non-zero drawdowns)
+    """
+    if curve.shape[0] == 0:
+        return 0.0, 0, 0, 0.0
+
+    # NaN points are skipped, matching the comparisons in the Numba kernel
+    peak = np.fmax.accumulate(curve)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = (peak - curve) / peak
+    is_positive = drawdown > 0
+    positive = drawdown[is_positive]
+    if positive.size == 0:
+        return 0.0, 0, 0, 0.0
+
+    end_idx = int(np.argmax(np.where(is_positive, drawdown, 0.0)))
+    # The peak is the last point at the running maximum before the trough
+    start_idx = int(np.flatnonzero(curve[: end_idx + 1] == peak[: end_idx + 1])[-1])
+    avg_dd = float(positive.sum() / positive.size)
+    return float(drawdown[end_idx]), start_idx, end_idx, avg_dd
+
+
+def return_stats(
+    returns: np.ndarray,
+) -> Tuple[float, int, float, int, float, int]:
+    """Calculate summary statistics of returns
+
+    The standard deviation uses one degree of freedom.
+
+    Args:
+        returns: Period returns
+
+    Returns:
+        Tuple of (standard deviation, number of positive returns, mean of
+        positive returns, number of negative returns, mean of negative
+        returns, number of returns)
+    """
+    n = returns.shape[0]
+    wins = returns[returns > 0]
+    losses = returns[returns < 0]
+
+    with np.errstate(invalid="ignore"):
+        std = float(returns.std(ddof=1)) if n > 1 else np.nan
+    win_mean = float(wins.mean()) if wins.size > 0 else 0.0
+    loss_mean = float(losses.mean()) if losses.size > 0 else 0.0
+    return std, wins.size, win_mean, losses.size, loss_mean, n
@@ -1,35 +1,118 @@
-from typing import Union, Dict, List
+from typing import TYPE_CHECKING, Union, Dict, List, Optional
+from pathlib import Path
+import hashlib
+import os
+import pickle
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import polars as pl
-import pandas as pd
+import numpy as np
 from pypostester.utils.validation import *
 from pypostester.indicators.registry import indicator_registry
 from pypostester.indicators.base import BaseIndicator
 from pypostester.models.models import BacktestResult
+from pypostester.core.constants import NANOSECONDS_PER_DAY
+from pypostester.core._kernels import (
+    funding_curve_kernel_fee,
+    funding_curve_kernel_free,
+    return_stats,
+)
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class PositionBacktester:
     def __init__(
         self,
-        close_df: Union[pl.DataFrame, pd.DataFrame],
+        close_df: Union[pl.DataFrame, "pd.DataFrame"],
         commission: float = 0.0,
         annual_trading_days: int = 252,
         indicators: Union[str, List[str]] = "all",
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_workers: Optional[int] = None,
     ) -> None:
+        """Initialize backtester
+
+        Args:
+            close_df: DataFrame containing close price data
+            commission: Commission rate charged on position changes
+            annual_trading_days: Number of trading days per year
+            indicators: "all" or list of indicator names to calculate
+            cache_dir: Directory for memoizing run results on disk. Results are
+                keyed by the input data, parameters and indicator names, so
+                changing a custom indicator's implementation under the same
+                name requires clearing the directory. Entries are loaded with
+                pickle, so the directory must only be writable by trusted
+                users. If None, results are not memoized.
+            max_workers: Number of threads used to calculate indicators that do
+                not depend on each other. If None, indicators are calculated
+                sequentially.
+        """
         try:
             # Validate parameters
             validate_commission(commission)
             validate_annual_trading_days(annual_trading_days)
-            self.sorted_indicators = validate_indicators(indicators)
+            validate_max_workers(max_workers)
+            self.indicators = indicators
+            self._build_plan()
 
             # Validate and convert input data
             self.close_df = validate_and_convert_input(close_df, data_type="close")
+            # Positions can only be attached row by row to unique timestamps
+            self._close_times_unique = bool(
+                self.close_df.get_column("time").is_unique().all()
+            )
             self.commission = commission
             self.annual_trading_days = annual_trading_days
-            self.indicators = indicators
+            self.max_workers = max_workers
+            self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+            if self.cache_dir is not None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
 
         except ValidationError as e:
             raise ValueError(f"Invalid input: {str(e)}")
 
+    def _build_plan(self) -> None:
+        """Resolve the indicators to calculate and their execution order
+
+        The sorted indicator names and the indicator instances are resolved
+        once, so runs skip dependency sorting and registry lookups.
+
+        Raises:
+            ValidationError: If the indicators parameter is invalid
+        """
+        self.sorted_indicators = validate_indicators(self.indicators)
+
+        plan = []
+        for name in self.sorted_indicators:
+            indicator = indicator_registry.get_indicator(name)
+            # Dependencies pulled in only for other indicators are not reported
+            report = self.indicators == "all" or name in self.indicators
+            plan.append(
+                (name, indicator, indicator.calculate, report, indicator.returns_frame)
+            )
+        self._plan = tuple(plan)
+
+        # Group indicators into levels whose members only depend on earlier levels
+        depths: Dict[str, int] = {}
+        levels: List[List] = []
+        for name, indicator, calculate, _, _ in plan:
+            depth = max(
+                (depths[dep] + 1 for dep in indicator.requires if dep in depths),
+                default=0,
+            )
+            depths[name] = depth
+            if depth == len(levels):
+                levels.append([])
+            levels[depth].append((name, calculate))
+        self._levels = tuple(tuple(level) for level in levels)
+
     def _calculate_funding_curve(self, merged_df: pl.DataFrame) -> pl.DataFrame:
         """Calculate funding curve
 
@@ -37,28 +120,25 @@ class PositionBacktester:
             merged_df: DataFrame containing close prices and positions
 
         Returns:
-            DataFrame with time, funding curve and returns
+            DataFrame with funding curve and returns, row-aligned with merged_df
         """
-        # Calculate returns
-        returns = merged_df["close"].pct_change().fill_null(0)
-
-        # Calculate position returns
-        position_returns = returns * merged_df["position"].shift(1).fill_null(0)
-
-        # Calculate transaction costs
-        position_changes = merged_df["position"].diff().abs().fill_null(0)
-        transaction_costs = position_changes * self.commission
-
-        # Calculate net returns
-        net_returns = position_returns - transaction_costs
-
-        # Calculate funding curve
-        funding_curve = (1 + net_returns).cum_prod()
+        # Extract contiguous float64 buffers (zero-copy when already float64)
+        close = merged_df.get_column("close").cast(pl.Float64).to_numpy()
+        position = merged_df.get_column("position").cast(pl.Float64).to_numpy()
+
+        # Calculate funding curve and net returns in a single fused pass
+        funding_curve = np.empty(len(close), dtype=np.float64)
+        net_returns = np.empty(len(close), dtype=np.float64)
+        if self.commission == 0:
+            funding_curve_kernel_free(close, position, funding_curve, net_returns)
+        else:
+            funding_curve_kernel_fee(
+                close, position, self.commission, funding_curve, net_returns
+            )
 
         # Create result DataFrame
         result = pl.DataFrame(
             {
-                "time": merged_df["time"],
                 "funding_curve": funding_curve,
                 "returns": net_returns,
             }
@@ -73,8 +153,9 @@ class PositionBacktester:
             indicator: Custom indicator instance inheriting from BaseIndicator
         """
         indicator_registry.register(indicator)
+        self._build_plan()
 
-    def run(self, position_df: Union[pl.DataFrame, pd.DataFrame]) -> BacktestResult:
+    def run(self, position_df: Union[pl.DataFrame, "pd.DataFrame"]) -> BacktestResult:
         """Run backtest and return results
 
         Args:
@@ -94,15 +175,50 @@ class PositionBacktester:
             validate_time_alignment(self.close_df, position_df)
 
             # Merge data and sort by time
-            merged_df = self.close_df.join(
-                position_df.select(["time", "position"]), on="time", how="inner"
-            ).sort("time")
+            close_times = self.close_df.get_column("time")
+            position_times = position_df.get_column("time")
+            if self._close_times_unique and close_times.equals(position_times):
+                # Both inputs are sorted on an identical grid of unique times;
+                # repeated times go through the join, which pairs every
+                # duplicate on one side with every duplicate on the other
+                merged_df = self.close_df.with_columns(
+                    position_df.get_column("position")
+                )
+            else:
+                # Run the join and sort as one lazy query
+                merged_df = (
+                    self.close_df.lazy()
+                    .join(
+                        position_df.lazy().select(["time", "position"]),
+                        on="time",
+                        how="inner",
+                    )
+                    .sort("time")
+                    .collect()
+                )
 
         except ValidationError as e:
             raise ValueError(f"Invalid position input: {str(e)}")
 
-        # Calculate funding curve
-        merged_df = merged_df.join(self._calculate_funding_curve(merged_df), on="time")
+        # Load memoized result for identical inputs if available
+        result_path = self._result_cache_path(merged_df)
+        if result_path is not None and result_path.exists():
+            try:
+                with open(result_path, "rb") as f:
+                    return pickle.load(f)
+            except (
+                pickle.UnpicklingError,
+                EOFError,
+                AttributeError,
+                TypeError,
+                ValueError,
+                ImportError,
+            ):
+                # Entries written by another version are recalculated
+                pass
+
+        # Calculate funding curve; rows are already aligned, so attach columns
+        merged_df = merged_df.hstack(self._calculate_funding_curve(merged_df))
 
         # Prepare cache
         cache = self._prepare_cache(merged_df)
@@ -118,12 +234,64 @@ class PositionBacktester:
         }
 
         # Create and return BacktestResult object
-        return BacktestResult(
+        result = BacktestResult(
             _dataframes={"merged_df": merged_df, **dataframes},
             _indicator_values=indicators,
             _formatted_indicator_values=formatted_indicators,
         )
 
+        if result_path is not None:
+            # Write to a uniquely named temporary file first, so readers never
+            # see partial data and concurrent writers of the same key do not
+            # share a file
+            with tempfile.NamedTemporaryFile(
+                dir=self.cache_dir, suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = f.name
+                try:
+                    pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+                except BaseException:
+                    f.close()
+                    os.unlink(tmp_path)
+                    raise
+            os.replace(tmp_path, result_path)
+
+        return result
+
+    def _result_cache_path(self, merged_df: pl.DataFrame) -> Optional[Path]:
+        """Get the on-disk memoization path for a run
+
+        Args:
+            merged_df: DataFrame containing time, close prices, positions and
+                any extra input columns
+
+        Returns:
+            Path of the memoized result, or None if memoization is disabled
+        """
+        if self.cache_dir is None:
+            return None
+
+        # Prefer the SIMD-accelerated xxh3 hash, falling back to blake2b
+        if xxhash is not None:
+            key = xxhash.xxh3_128()
+        else:
+            key = hashlib.blake2b(digest_size=20)
+        # The schema covers column names, dtypes and the time zone, which the
+        # buffers below do not capture
+        key.update(repr(merged_df.schema).encode())
+        key.update(merged_df.get_column("time").dt.epoch("ns").to_numpy())
+        key.update(merged_df.get_column("close").cast(pl.Float64).to_numpy())
+        key.update(merged_df.get_column("position").cast(pl.Float64).to_numpy())
+        # Extra input columns are returned in merged_df, so their data counts too
+        extra_df = merged_df.drop("time", "close", "position")
+        if extra_df.width > 0:
+            key.update(extra_df.hash_rows(seed=0).to_numpy())
+        key.update(
+            f"{self.commission!r}|{self.annual_trading_days}|"
+            f"{self.indicators!r}|{','.join(self.sorted_indicators)}".encode()
+        )
+        return self.cache_dir / f"{key.hexdigest()}.pkl"
+
     def _prepare_cache(self, merged_df: pl.DataFrame) -> Dict:
         """Prepare calculation cache
 
@@ -133,24 +301,43 @@ class PositionBacktester:
         Returns:
             Dict containing cached data needed for calculations
         """
-        times = merged_df.get_column("time")
+        # Timestamps as int64 nanoseconds, avoiding Python datetime objects
+        time_ns = merged_df.get_column("time").dt.epoch("ns").to_numpy()
 
         # Calculate total days
-        total_days = (times[-1] - times[0]).total_seconds() / (24 * 3600)
-        total_days = max(total_days, 1)  # Ensure at least 1 day
+        span_days = (time_ns[-1] - time_ns[0]) / NANOSECONDS_PER_DAY
+        total_days = max(span_days, 1)  # Ensure at least 1 day
 
-        # Calculate data frequency (in days)
-        time_diffs = times.diff().drop_nulls()
-        avg_interval = float(time_diffs.mean().total_seconds()) / (24 * 3600)
+        # Calculate data frequency (in days); the mean of consecutive
+        # differences of a sorted series telescopes to span / (n - 1)
+        avg_interval = span_days / (len(time_ns) - 1) if len(time_ns) > 1 else 0
 
         # Calculate periods per day
         periods_per_day = 1 / avg_interval if avg_interval > 0 else 1
 
+        # Calendar days covered by the curve at the sampled frequency
+        actual_days = len(time_ns) / periods_per_day
+
+        # Calculate return statistics in a single pass
+        returns = merged_df.get_column("returns").to_numpy()
+        std, wins, win_mean, losses, loss_mean, n = return_stats(returns)
+
         return {
             "merged_df": merged_df,
+            "time_ns": time_ns,
+            "funding_curve_np": merged_df.get_column("funding_curve").to_numpy(),
+            "returns_np": returns,
+            "returns_std": std,
+            "returns_wins": wins,
+            "returns_win_mean": win_mean,
+            "returns_losses": losses,
+            "returns_loss_mean": loss_mean,
+            "returns_count": n,
             "annual_trading_days": self.annual_trading_days,
             "total_days": total_days,
             "periods_per_day": periods_per_day,
+            "sqrt_annual_periods": np.sqrt(periods_per_day * self.annual_trading_days),
+            "annual_return_exponent": 365 / actual_days,
         }
 
     def _calculate_indicators(self, cache: Dict) -> Dict:
@@ -162,26 +349,47 @@ class PositionBacktester:
         Returns:
             Dict containing calculation results with both DataFrames and indicator values
         """
+        values = dict()
+        if self.max_workers is None or self.max_workers <= 1:
+            for name, _, calculate, _, _ in self._plan:
+                values[name] = calculate(cache)
+        else:
+            # Indicators within a level are independent and only read the cache
+            # entries written by earlier levels
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for level in self._levels:
+                    if len(level) == 1:
+                        name, calculate = level[0]
+                        values[name] = calculate(cache)
+                        continue
+                    futures = [
+                        (name, pool.submit(calculate, cache))
+                        for name, calculate in level
+                    ]
+                    for name, future in futures:
+                        values[name] = future.result()
+
         result = dict()
         result["dataframes"] = dict()
         result["indicators"] = dict()
-        for indicator in self.sorted_indicators:
-            value = validate_data_type(
-                indicator_registry.get_indicator(indicator).calculate(cache)
-            )
+        for name, indicator, _, report, returns_frame in self._plan:
+            value = values[name]
+            if returns_frame or not isinstance(value, float):
+                # Anything but a float from a scalar indicator is validated
+                # and dispatched on its type, whatever returns_frame says
+                value = validate_data_type(value)
+                is_frame = isinstance(value, pl.DataFrame)
+            else:
+                is_frame = False
 
-            if self.indicators != "all" and indicator not in self.indicators:
+            if not report:
                 continue
-
-            if isinstance(value, pl.DataFrame):
-                result["dataframes"][indicator] = value
+            if is_frame:
+                result["dataframes"][name] = value
             else:
-                formatted_value = indicator_registry.get_indicator(indicator).format(
-                    value
-                )
-                result["indicators"][indicator] = {
+                result["indicators"][name] = {
                     "value": value,
-                    "formatted_value": formatted_value,
+                    "formatted_value": indicator.format(value),
                 }
 
         return result
@@ -4,4 +4,7 @@ from pathlib import Path
 
 
 # Required columns for input data
-REQUIRED_COLUMNS = {"close": ["time", "close"], "position": ["time", "position"]}
+REQUIRED_COLUMNS = {"close": ("time", "close"), "position": ("time", "position")}
+
+# Number of nanoseconds in one day
+NANOSECONDS_PER_DAY = 24 * 3600 * 10**9
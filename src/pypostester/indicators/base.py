@@ -1,20 +1,35 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Set, Union
+from typing import ClassVar, Dict, Set, Union
 import polars as pl
 
 
 class BaseIndicator(ABC):
-    """Base class for indicators"""
+    """Base class for indicators
 
-    @property
-    @abstractmethod
-    def name(self) -> str:
-        """Indicator name
+    Subclasses declare their unique identifier in the name class attribute.
+    Indicators whose calculate method returns a DataFrame should set
+    returns_frame to True; all others are expected to return a float. A
+    DataFrame returned without the flag is still stored as a DataFrame.
+    """
 
-        Returns:
-            Unique identifier string for the indicator
+    __slots__ = ()
+
+    name: ClassVar[str] = ""  # Unique identifier for the indicator
+    returns_frame: ClassVar[bool] = False  # Whether calculate returns a DataFrame
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        """Check that concrete subclasses declare a name
+
+        Raises:
+            TypeError: If a concrete subclass does not define a name
         """
-        pass
+        super().__init_subclass__(**kwargs)
+        is_abstract = any(
+            getattr(getattr(cls, attr, None), "__isabstractmethod__", False)
+            for attr in ("calculate", "format")
+        )
+        if not is_abstract and not cls.name:
+            raise TypeError(f"Indicator class {cls.__name__} must define a name")
 
     @property
     def requires(self) -> Set[str]:
@@ -1,15 +1,36 @@
-from typing import Dict, Set
-import polars as pl
-import numpy as np
+import math
+from typing import Dict, Set, Tuple
 from pypostester.indicators.base import BaseIndicator
+from pypostester.core.constants import NANOSECONDS_PER_DAY
+from pypostester.core._kernels import drawdown_stats
+
+
+def _drawdown_stats(cache: Dict) -> Tuple[float, float]:
+    """Get drawdown statistics shared by the drawdown indicators
+
+    The funding curve is scanned once; the peak and trough positions of the
+    maximum drawdown are also stored in the cache.
+
+    Args:
+        cache: Dictionary containing calculation cache
+
+    Returns:
+        Tuple of (maximum drawdown, average drawdown)
+    """
+    if "drawdown_stats" not in cache:
+        max_dd, start_idx, end_idx, avg_dd = drawdown_stats(cache["funding_curve_np"])
+        cache["max_drawdown_start_idx"] = int(start_idx)
+        cache["max_drawdown_end_idx"] = int(end_idx)
+        cache["drawdown_stats"] = (float(max_dd), float(avg_dd))
+    return cache["drawdown_stats"]
 
 
 class TotalReturn(BaseIndicator):
     """Total return indicator"""
 
-    @property
-    def name(self) -> str:
-        return "total_return"
+    __slots__ = ()
+
+    name = "total_return"
 
     def calculate(self, cache: Dict) -> float:
         """Calculate total return
@@ -21,8 +42,8 @@ class TotalReturn(BaseIndicator):
             Total return as a float
         """
         if "total_return" not in cache:
-            curve = cache["merged_df"].get_column("funding_curve")
-            cache["total_return"] = float(curve.tail(1)[0] / curve[0] - 1)
+            curve = cache["funding_curve_np"]
+            cache["total_return"] = float(curve[-1] / curve[0] - 1)
         return cache["total_return"]
 
     def format(self, value: float) -> str:
@@ -40,9 +61,9 @@ class TotalReturn(BaseIndicator):
 class AnnualReturn(BaseIndicator):
     """Annualized return indicator"""
 
-    @property
-    def name(self) -> str:
-        return "annual_return"
+    __slots__ = ()
+
+    name = "annual_return"
 
     @property
     def requires(self) -> Set[str]:
@@ -64,13 +85,14 @@ class AnnualReturn(BaseIndicator):
         """
         if "annual_return" not in cache:
             total_return = cache["total_return"]
-            periods_per_day = cache["periods_per_day"]
-            total_periods = len(cache["merged_df"].get_column("funding_curve"))
-            actual_days = total_periods / periods_per_day
+            exponent = cache["annual_return_exponent"]
 
-            cache["annual_return"] = float(
-                ((1 + total_return) ** (365 / actual_days)) - 1
-            )
+            if total_return > -1:
+                # log1p/expm1 stay accurate for returns close to zero
+                annual_return = math.expm1(math.log1p(total_return) * exponent)
+            else:
+                annual_return = ((1 + total_return) ** exponent) - 1
+            cache["annual_return"] = float(annual_return)
         return cache["annual_return"]
 
     def format(self, value: float) -> str:
@@ -88,9 +110,9 @@ class AnnualReturn(BaseIndicator):
 class Volatility(BaseIndicator):
     """Volatility indicator"""
 
-    @property
-    def name(self) -> str:
-        return "volatility"
+    __slots__ = ()
+
+    name = "volatility"
 
     def calculate(self, cache: Dict) -> float:
         """Calculate annualized volatility
@@ -101,11 +123,8 @@ class Volatility(BaseIndicator):
         Returns:
             Annualized volatility as a float
         """
-        returns = cache["merged_df"].get_column("returns")
-        periods_per_day = cache["periods_per_day"]
-        annual_periods = periods_per_day * cache["annual_trading_days"]
-
-        volatility = returns.std() * np.sqrt(annual_periods)
+        # Annualization factor sqrt(periods per day * trading days) is precomputed
+        volatility = float(cache["returns_std"] * cache["sqrt_annual_periods"])
         cache["volatility"] = volatility
         return volatility
 
@@ -124,9 +143,9 @@ class Volatility(BaseIndicator):
 class SharpeRatio(BaseIndicator):
     """Sharpe ratio indicator"""
 
-    @property
-    def name(self) -> str:
-        return "sharpe_ratio"
+    __slots__ = ()
+
+    name = "sharpe_ratio"
 
     @property
     def requires(self) -> Set[str]:
@@ -147,10 +166,7 @@ class SharpeRatio(BaseIndicator):
             Sharpe ratio as a float
         """
         if "sharpe_ratio" not in cache:
-            if "volatility" not in cache:
-                volatility_indicator = Volatility()
-                cache["volatility"] = volatility_indicator.calculate(cache)
-
+            # Dependencies are calculated first, see IndicatorRegistry
             annual_vol = cache["volatility"]
             cache["sharpe_ratio"] = float(
                 cache["annual_return"] / annual_vol if annual_vol != 0 else 0
@@ -172,17 +188,17 @@ class SharpeRatio(BaseIndicator):
 class MaxDrawdown(BaseIndicator):
     """Maximum drawdown indicator"""
 
-    @property
-    def name(self) -> str:
-        return "max_drawdown"
+    __slots__ = ()
+
+    name = "max_drawdown"
 
     def calculate(self, cache: Dict) -> float:
         """Calculate maximum drawdown
 
         Calculation method:
-        1. Calculate historical peak at each point
+        1. Track the historical peak while scanning the funding curve
         2. Calculate drawdown from peak at each point
-        3. Find the maximum drawdown value
+        3. Keep the maximum drawdown together with its peak and trough positions
 
         Args:
             cache: Dictionary containing calculation cache
@@ -191,22 +207,7 @@ class MaxDrawdown(BaseIndicator):
             Maximum drawdown as a float
         """
         if "max_drawdown" not in cache:
-            df = cache["merged_df"]
-
-            # Calculate historical peak
-            df = df.with_columns(pl.col("funding_curve").cum_max().alias("peak"))
-
-            # Calculate drawdown
-            df = df.with_columns(
-                ((pl.col("peak") - pl.col("funding_curve")) / pl.col("peak")).alias(
-                    "drawdown"
-                )
-            )
-
-            # Get maximum drawdown
-            max_dd = float(df.get_column("drawdown").max())
-
-            cache["max_drawdown"] = max_dd
+            cache["max_drawdown"] = _drawdown_stats(cache)[0]
 
         return cache["max_drawdown"]
 
@@ -225,9 +226,9 @@ class MaxDrawdown(BaseIndicator):
 class MaxDrawdownDuration(BaseIndicator):
     """Maximum drawdown duration indicator"""
 
-    @property
-    def name(self) -> str:
-        return "max_drawdown_duration"
+    __slots__ = ()
+
+    name = "max_drawdown_duration"
 
     @property
     def requires(self) -> Set[str]:
@@ -247,32 +248,16 @@ class MaxDrawdownDuration(BaseIndicator):
         Returns:
             Maximum drawdown duration in days as a float
         """
-        df = cache["merged_df"]
-
-        # Calculate historical peak
-        df = df.with_columns(pl.col("funding_curve").cum_max().alias("peak"))
+        time_ns = cache["time_ns"]
 
-        # Calculate drawdown
-        df = df.with_columns(
-            ((pl.col("peak") - pl.col("funding_curve")) / pl.col("peak")).alias(
-                "drawdown"
-            )
-        )
-
-        # Find the end time of the maximum drawdown
-        max_drawdown_idx = df.get_column("drawdown").arg_max()
-        max_drawdown_end = df.get_column("time")[max_drawdown_idx]
-
-        # Find the start time of the drawdown (most recent peak)
-        peak_before_max_dd = (
-            df.filter(pl.col("time") <= max_drawdown_end)
-            .filter(pl.col("funding_curve") == pl.col("peak"))
-            .get_column("time")[-1]
-        )
+        # Peak and trough positions are recorded by the max_drawdown indicator
+        max_drawdown_start = time_ns[cache["max_drawdown_start_idx"]]
+        max_drawdown_end = time_ns[cache["max_drawdown_end_idx"]]
 
         # Calculate duration in days
-        duration_seconds = (max_drawdown_end - peak_before_max_dd).total_seconds()
-        duration_days = duration_seconds / (24 * 3600)
+        duration_days = float(
+            (max_drawdown_end - max_drawdown_start) / NANOSECONDS_PER_DAY
+        )
 
         cache["max_drawdown_duration"] = duration_days
         return duration_days
@@ -292,9 +277,9 @@ class MaxDrawdownDuration(BaseIndicator):
 class WinRate(BaseIndicator):
     """Win rate indicator"""
 
-    @property
-    def name(self) -> str:
-        return "win_rate"
+    __slots__ = ()
+
+    name = "win_rate"
 
     def calculate(self, cache: Dict) -> float:
         """Calculate win rate
@@ -305,12 +290,10 @@ class WinRate(BaseIndicator):
         Returns:
             Win rate as a float
         """
-        returns = cache["merged_df"].get_column("returns")
-        total_trades = len(returns)
+        total_trades = cache["returns_count"]
         if total_trades == 0:
             return 0.0
-        winning_trades = (returns > 0).sum()
-        win_rate = winning_trades / total_trades
+        win_rate = cache["returns_wins"] / total_trades
         cache["win_rate"] = win_rate
         return win_rate
 
@@ -329,9 +312,9 @@ class WinRate(BaseIndicator):
 class AvgDrawdown(BaseIndicator):
     """Average drawdown indicator"""
 
-    @property
-    def name(self) -> str:
-        return "avg_drawdown"
+    __slots__ = ()
+
+    name = "avg_drawdown"
 
     def calculate(self, cache: Dict) -> float:
         """Calculate average drawdown
@@ -341,6 +324,8 @@ class AvgDrawdown(BaseIndicator):
         2. Consider only non-zero drawdowns
         3. Calculate the average of these drawdowns
 
+        The drawdowns are accumulated in the same pass as the maximum drawdown.
+
         Args:
             cache: Dictionary containing calculation cache
 
@@ -348,23 +333,7 @@ class AvgDrawdown(BaseIndicator):
             Average drawdown as a float
         """
         if "avg_drawdown" not in cache:
-            curve = cache["merged_df"].get_column("funding_curve")
-
-            # Calculate historical peak
-            peak = curve.cum_max()
-
-            # Calculate drawdown
-            drawdown = (peak - curve) / peak
-
-            # Consider only non-zero drawdowns
-            non_zero_drawdown = drawdown.filter(drawdown > 0)
-
-            # Calculate average drawdown
-            avg_dd = float(
-                non_zero_drawdown.mean() if len(non_zero_drawdown) > 0 else 0
-            )
-
-            cache["avg_drawdown"] = avg_dd
+            cache["avg_drawdown"] = _drawdown_stats(cache)[1]
 
         return cache["avg_drawdown"]
 
@@ -387,9 +356,9 @@ class ProfitLossRatio(BaseIndicator):
     Profit-loss ratio = |average return of winning trades| / |average return of losing trades|
     """
 
-    @property
-    def name(self) -> str:
-        return "profit_loss_ratio"
+    __slots__ = ()
+
+    name = "profit_loss_ratio"
 
     def calculate(self, cache: Dict) -> float:
         """Calculate profit-loss ratio
@@ -401,15 +370,13 @@ class ProfitLossRatio(BaseIndicator):
             Profit-loss ratio as a float
         """
         if "profit_loss_ratio" not in cache:
-            returns = cache["merged_df"].get_column("returns")
-
-            # Separate winning and losing trades
-            profit_trades = returns.filter(returns > 0)
-            loss_trades = returns.filter(returns < 0)
-
-            # Calculate average profit and average loss
-            avg_profit = profit_trades.mean() if len(profit_trades) > 0 else 0
-            avg_loss = abs(loss_trades.mean()) if len(loss_trades) > 0 else float("inf")
+            # Per-side means are accumulated in the single returns pass
+            avg_profit = cache["returns_win_mean"] if cache["returns_wins"] > 0 else 0
+            avg_loss = (
+                abs(cache["returns_loss_mean"])
+                if cache["returns_losses"] > 0
+                else float("inf")
+            )
 
             # Calculate profit-loss ratio
             if avg_loss == 0:  # Avoid division by zero
@@ -433,3 +400,18 @@ class ProfitLossRatio(BaseIndicator):
         if value == float("inf"):
             return "∞"
         return f"{value:.2f}"
+
+
+# Built-in indicators in registration order; kept alphabetical by class name
+# so the dependency sort and report order stay stable
+BUILTIN_INDICATORS = (
+    AnnualReturn,
+    AvgDrawdown,
+    MaxDrawdown,
+    MaxDrawdownDuration,
+    ProfitLossRatio,
+    SharpeRatio,
+    TotalReturn,
+    Volatility,
+    WinRate,
+)
@@ -1,5 +1,4 @@
-from typing import Dict, Type, List
-import inspect
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
 from pypostester.indicators.base import BaseIndicator
 from pypostester.indicators import indicators
 
@@ -10,66 +9,97 @@ class IndicatorRegistry:
     """Registry for managing indicators"""
 
     def __init__(self):
-        self._indicators: Dict[str, Type[BaseIndicator]] = {}
+        self._indicators: Dict[str, BaseIndicator] = {}
+        self._deps: Dict[str, Tuple[str, ...]] = {}
+        self._available_indicators: Optional[Tuple[str, ...]] = None
+        self._available_indicator_set: FrozenSet[str] = frozenset()
+        self._sorted_indicators: Tuple[str, ...] = ()
+        self._closures: Dict[str, FrozenSet[str]] = {}
+        self._dependencies_sorted = True
         self._register_builtin_indicators()
 
     def _register_builtin_indicators(self) -> None:
-        """Automatically register all built-in indicators
-
-        This method scans the indicators module and registers all classes
-        that inherit from BaseIndicator
-        """
-        # Get all members from indicators module
-        for name, obj in inspect.getmembers(indicators):
-            # Check if it's a class and inherits from BaseIndicator
-            if (
-                inspect.isclass(obj)
-                and issubclass(obj, BaseIndicator)
-                and obj != BaseIndicator
-            ):
-                self.register(obj(), update_dependency=False)
-        self._sort_indicators_by_dependency()
+        """Register all built-in indicators listed in the indicators module"""
+        self.register_many(cls() for cls in indicators.BUILTIN_INDICATORS)
 
     def _sort_indicators_by_dependency(self) -> None:
         """Sort indicators based on their dependencies
 
         This method performs a topological sort to ensure indicators
-        are calculated in the correct order based on their dependencies
+        are calculated in the correct order based on their dependencies.
+        The depth-first traversal uses an explicit stack, so deep
+        dependency chains do not hit the recursion limit
         """
         sorted_indicators = []
         visited = set()
 
-        def visit(indicator_name):
-            if indicator_name in visited:
-                return
-            visited.add(indicator_name)
-            indicator_class = self._indicators[indicator_name]
-            # Get dependencies
-            dependencies = indicator_class().requires
-            for dep in dependencies:
-                if dep in self._indicators:
-                    visit(dep)
-            sorted_indicators.append(indicator_name)
-
-        for name in self._indicators:
-            visit(name)
+        for root in self._indicators:
+            if root in visited:
+                continue
+            visited.add(root)
+            # Each stack entry holds an indicator and its pending dependencies
+            stack = [(root, iter(self._deps[root]))]
+            while stack:
+                indicator_name, dependencies = stack[-1]
+                for dep in dependencies:
+                    if dep in self._indicators and dep not in visited:
+                        visited.add(dep)
+                        stack.append((dep, iter(self._deps[dep])))
+                        break
+                else:
+                    stack.pop()
+                    sorted_indicators.append(indicator_name)
 
         # Update indicators order
-        self._sorted_indicators = sorted_indicators
+        self._sorted_indicators = tuple(sorted_indicators)
+
+        # Dependencies precede their dependents, so one pass builds the
+        # transitive closure of every indicator
+        closures = {}
+        for name in sorted_indicators:
+            closures[name] = frozenset((name,)).union(
+                *(closures.get(dep, (dep,)) for dep in self._deps[name])
+            )
+        self._closures = closures
+        self._dependencies_sorted = True
+
+    def _ensure_sorted(self) -> None:
+        """Sort dependencies deferred by registering with update_dependency=False"""
+        if not self._dependencies_sorted:
+            self._sort_indicators_by_dependency()
 
     def register(
         self, indicator: BaseIndicator, update_dependency: bool = True
     ) -> None:
         """Register a new indicator
 
+        The instance is kept and shared by every backtester, so indicators
+        must not hold per-run state; results belong in the calculation cache.
+
         Args:
             indicator: Instance of BaseIndicator to register
-            update_dependency: Whether to update dependency sorting after registration
+            update_dependency: Whether to update dependency sorting after
+                registration. If False, sorting is deferred until the order or
+                dependencies are next needed
         """
-        self._indicators[indicator.name] = indicator.__class__
+        self._indicators[indicator.name] = indicator
+        self._deps[indicator.name] = tuple(indicator.requires)
+        self._available_indicators = None
+        self._available_indicator_set = frozenset(self._indicators)
+        self._dependencies_sorted = False
         if update_dependency:
             self._sort_indicators_by_dependency()
 
+    def register_many(self, indicators: Iterable[BaseIndicator]) -> None:
+        """Register several indicators, sorting dependencies once at the end
+
+        Args:
+            indicators: Instances of BaseIndicator to register
+        """
+        for indicator in indicators:
+            self.register(indicator, update_dependency=False)
+        self._sort_indicators_by_dependency()
+
     def get_indicator(self, name: str) -> BaseIndicator:
         """Get indicator instance by name
 
@@ -77,31 +107,67 @@ class IndicatorRegistry:
             name: Name of the indicator to retrieve
 
         Returns:
-            New instance of the requested indicator
+            Registered instance of the requested indicator
 
         Raises:
             ValueError: If indicator name is not found in registry
         """
-        if name not in self._indicators:
+        indicator = self._indicators.get(name)
+        if indicator is None:
             raise ValueError(f"Unknown indicator: {name}")
-        return self._indicators[name]()
+        return indicator
+
+    def resolve_dependencies(self, names: Iterable[str]) -> FrozenSet[str]:
+        """Get indicator names together with all their transitive dependencies
+
+        Args:
+            names: Names of registered indicators
+
+        Returns:
+            Frozenset of the given names and every indicator they require
+
+        Raises:
+            ValidationError: If a name is not a registered indicator
+        """
+        self._ensure_sorted()
+        try:
+            return frozenset().union(*(self._closures[name] for name in names))
+        except KeyError as e:
+            # Imported here since the validation module imports this registry
+            from pypostester.utils.validation import ValidationError
+
+            raise ValidationError(f"Unknown indicator: {e.args[0]}") from None
+
+    @property
+    def available_indicators(self) -> Tuple[str, ...]:
+        """Get all available indicator names
+
+        The sorted names are cached until the next registration.
+
+        Returns:
+            Sorted tuple of registered indicator names
+        """
+        if self._available_indicators is None:
+            self._available_indicators = tuple(sorted(self._indicators))
+        return self._available_indicators
 
     @property
-    def available_indicators(self) -> List[str]:
-        """Get list of all available indicator names
+    def available_indicator_set(self) -> FrozenSet[str]:
+        """Get all available indicator names for membership checks
 
         Returns:
-            Sorted list of registered indicator names
+            Frozenset of registered indicator names
         """
-        return sorted(self._indicators.keys())
+        return self._available_indicator_set
 
     @property
-    def sorted_indicators(self) -> Dict[str, Type[BaseIndicator]]:
+    def sorted_indicators(self) -> Tuple[str, ...]:
         """Get all indicators sorted by dependency
 
         Returns:
-            List of indicator names in dependency order
+            Tuple of indicator names in dependency order
         """
+        self._ensure_sorted()
         return self._sorted_indicators
 
 
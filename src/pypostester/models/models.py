@@ -1,22 +1,52 @@
-from typing import Dict
+from typing import Dict, Optional, Tuple
+import numpy as np
 import polars as pl
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class BacktestResult:
     """Backtest result model class"""
 
     _dataframes: Dict[str, pl.DataFrame]
     _indicator_values: Dict[str, float]
     _formatted_indicator_values: Dict[str, str]
+    _funding_curve: Optional[pl.DataFrame] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _indicators_df: Optional[pl.DataFrame] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _drawdown_series: Optional[Tuple[pl.Series, pl.Series]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @property
     def funding_curve(self) -> pl.DataFrame:
         """Get funding curve DataFrame"""
-        return self._dataframes["merged_df"].select(
-            pl.col("time"), pl.col("funding_curve")
-        )
+        if self._funding_curve is None:
+            self._funding_curve = self._dataframes["merged_df"].select(
+                pl.col("time"), pl.col("funding_curve")
+            )
+        return self._funding_curve
+
+    @property
+    def drawdown_series(self) -> Tuple[pl.Series, pl.Series]:
+        """Get running peak and drawdown of the funding curve
+
+        Computed once and shared by every figure that needs them.
+
+        Returns:
+            Tuple of (running maximum, drawdown as a non-positive fraction)
+        """
+        if self._drawdown_series is None:
+            curve = self.funding_curve.get_column("funding_curve").to_numpy()
+            cummax = np.maximum.accumulate(curve)
+            self._drawdown_series = (
+                pl.Series("cummax", cummax),
+                pl.Series("drawdown", (curve - cummax) / cummax),
+            )
+        return self._drawdown_series
 
     @property
     def dataframes(self) -> Dict[str, pl.DataFrame]:
@@ -68,11 +98,12 @@ class BacktestResult:
 
     def print(self) -> None:
         """Print backtest results in tabular format"""
-        indicators_df = pl.DataFrame(
-            {
-                "indicator": list(self.formatted_indicator_values.keys()),
-                "value": list(self.formatted_indicator_values.values()),
-            }
-        )
-
-        print(indicators_df)
+        if self._indicators_df is None:
+            self._indicators_df = pl.DataFrame(
+                {
+                    "indicator": list(self.formatted_indicator_values.keys()),
+                    "value": list(self.formatted_indicator_values.values()),
+                }
+            )
+
+        print(self._indicators_df)
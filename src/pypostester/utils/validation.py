@@ -1,11 +1,18 @@
 """Data validation utilities"""
 
-from typing import Union, Literal, List
+import sys
+from typing import TYPE_CHECKING, Union, Literal, List, Optional
 import polars as pl
-import pandas as pd
 from pypostester.core.constants import REQUIRED_COLUMNS
 from pypostester.indicators.registry import indicator_registry
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Types accepted as indicator results
+_VALID_DATA_TYPES = (float, pl.DataFrame)
+
 
 class ValidationError(Exception):
     """Exception raised for errors in the data validation process."""
@@ -45,6 +52,23 @@ def validate_annual_trading_days(days: int) -> None:
         raise ValidationError("Annual trading days cannot exceed 365")
 
 
+def validate_max_workers(max_workers: Optional[int]) -> None:
+    """Validate number of indicator worker threads
+
+    Args:
+        max_workers: Number of worker threads, or None for sequential calculation
+
+    Raises:
+        ValidationError: If max_workers is not None or a positive integer
+    """
+    if max_workers is None:
+        return
+    if not isinstance(max_workers, int):
+        raise ValidationError("Max workers must be an integer or None")
+    if max_workers <= 0:
+        raise ValidationError("Max workers must be positive")
+
+
 def validate_indicators(indicators: Union[str, List[str]]) -> List[str]:
     """Validate indicator parameters and return sorted list of indicators including dependencies
 
@@ -63,35 +87,31 @@ def validate_indicators(indicators: Union[str, List[str]]) -> List[str]:
     sorted_indicators = indicator_registry.sorted_indicators
 
     if indicators == "all":
-        return sorted_indicators
+        return list(sorted_indicators)
 
     # Validate all indicators are available
-    invalid_indicators = set(indicators) - set(indicator_registry.available_indicators)
-    if invalid_indicators:
+    available_indicators = indicator_registry.available_indicator_set
+    if not available_indicators.issuperset(indicators):
+        invalid_indicators = set(indicators).difference(available_indicators)
         raise ValidationError(
             f"Invalid indicator names: {list(invalid_indicators)}. "
-            f"Available indicators: {indicator_registry.available_indicators}"
+            f"Available indicators: {list(indicator_registry.available_indicators)}"
         )
 
     # Collect all required indicators (including dependencies)
-    required_indicators = set(indicators)
-    pending_indicators = list(indicators)
-
-    while pending_indicators:
-        indicator = pending_indicators.pop()
-        indicator_cls = indicator_registry.get_indicator(indicator)
-        if len(indicator_cls.requires) > 0:
-            for required in indicator_cls.requires:
-                if required not in required_indicators:
-                    required_indicators.add(required)
-                    pending_indicators.append(required)
+    required_indicators = indicator_registry.resolve_dependencies(indicators)
+    missing_dependencies = required_indicators.difference(available_indicators)
+    if missing_dependencies:
+        raise ValidationError(
+            f"Unknown indicator dependencies: {sorted(missing_dependencies)}"
+        )
 
     # Return specified indicators (including dependencies) in registry order
     return [name for name in sorted_indicators if name in required_indicators]
 
 
 def validate_and_convert_input(
-    df: Union[pl.DataFrame, pd.DataFrame], data_type: Literal["close", "position"]
+    df: Union[pl.DataFrame, "pd.DataFrame"], data_type: Literal["close", "position"]
 ) -> pl.DataFrame:
     """Validate and convert input data
 
@@ -105,37 +125,41 @@ def validate_and_convert_input(
     Raises:
         ValidationError: If data does not meet requirements
     """
-    try:
-        # Convert to Polars DataFrame
-        if isinstance(df, pd.DataFrame):
+    # Convert to Polars DataFrame; a pandas DataFrame can only be passed
+    # in once the caller has imported pandas, so it is never imported here
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(df, pd.DataFrame):
+        try:
             df = pl.from_pandas(df)
+        except Exception as e:
+            raise ValidationError(f"Data validation failed: {str(e)}")
+    elif not isinstance(df, pl.DataFrame):
+        raise ValidationError("Input data must be a polars or pandas DataFrame")
 
-        # Validate required columns
-        required_cols = REQUIRED_COLUMNS[data_type]
-        missing_cols = [col for col in required_cols if col not in df.columns]
-        if missing_cols:
-            raise ValidationError(f"Missing required columns: {missing_cols}")
-
-        # Validate time column type
-        if not pl.Series(df["time"]).dtype.is_temporal():
-            raise ValidationError("Time column must be datetime type")
+    # Validate required columns
+    columns = set(df.columns)
+    missing_cols = [col for col in REQUIRED_COLUMNS[data_type] if col not in columns]
+    if missing_cols:
+        raise ValidationError(f"Missing required columns: {missing_cols}")
 
-        # Validate time sorting
-        if not pl.Series(df["time"]).is_sorted():
-            df = df.sort("time")
+    # Validate time column type
+    time = df.get_column("time")
+    if not time.dtype.is_temporal():
+        raise ValidationError("Time column must be datetime type")
 
-        # Validate position value range (if position data)
-        if data_type == "position":
-            position_values = df["position"]
-            if (position_values < -1).any() or (position_values > 1).any():
-                raise ValidationError("Position values must be between -1 and 1")
+    # Validate time sorting
+    if not time.is_sorted():
+        df = df.sort("time")
 
-        return df
+    # Validate position value range (if position data)
+    if data_type == "position":
+        position_values = df["position"]
+        if not position_values.dtype.is_numeric():
+            raise ValidationError("Position column must be numeric")
+        if not position_values.is_between(-1, 1).all():
+            raise ValidationError("Position values must be between -1 and 1")
 
-    except Exception as e:
-        if not isinstance(e, ValidationError):
-            raise ValidationError(f"Data validation failed: {str(e)}")
-        raise
+    return df
 
 
 def validate_time_alignment(close_df: pl.DataFrame, position_df: pl.DataFrame) -> None:
@@ -146,12 +170,25 @@ def validate_time_alignment(close_df: pl.DataFrame, position_df: pl.DataFrame) -
         position_df: Position data DataFrame
 
     Raises:
-        ValidationError: If timestamps are not aligned
+        ValidationError: If the time types differ or timestamps are not aligned
     """
-    close_times = set(close_df["time"])
-    position_times = set(position_df["time"])
+    close_times = close_df.get_column("time")
+    position_times = position_df.get_column("time")
+
+    # Timestamps of different types (unit, time zone, date vs datetime) are
+    # never aligned, and casting could make differing values compare equal
+    if close_times.dtype != position_times.dtype:
+        raise ValidationError(
+            "Close and position time columns must have the same type, got "
+            f"{close_times.dtype} and {position_times.dtype}"
+        )
+
+    # Fast path: both inputs share the same time grid
+    if close_times.equals(position_times):
+        return
 
-    if close_times != position_times:
+    # Otherwise compare the distinct timestamps as columns
+    if not close_times.unique().sort().equals(position_times.unique().sort()):
         raise ValidationError("Close and position data must have identical timestamps")
 
 
@@ -167,7 +204,7 @@ def validate_data_type(data) -> Union[float, pl.DataFrame]:
     Raises:
         ValidationError: If data type is invalid
     """
-    if isinstance(data, (float, pl.DataFrame)):
+    if isinstance(data, _VALID_DATA_TYPES):
         return data
     else:
         raise ValidationError("Data must be of type float or polars.DataFrame")
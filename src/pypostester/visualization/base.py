@@ -1,13 +1,33 @@
 from abc import ABC, abstractmethod
-import plotly.graph_objects as go
+from typing import TYPE_CHECKING, Optional, Tuple
+import numpy as np
+import polars as pl
 from pypostester.models.models import BacktestResult
 
+# Plotly is imported when a figure is built, keeping it off the import path
+# of backtest-only users
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+# Layout shared by all figures; Plotly copies it into each figure's layout
+_GRID = dict(showgrid=True, gridwidth=1, gridcolor="rgba(128,128,128,0.2)")
+_BASE_LAYOUT = dict(
+    showlegend=True,
+    hovermode="x unified",
+    plot_bgcolor="white",
+    hoverlabel=dict(bgcolor="white", font_size=12, font_family="Microsoft YaHei"),
+    xaxis=dict(_GRID, rangeslider=dict(visible=False)),
+    yaxis=_GRID,
+)
+
 
 class BaseFigure(ABC):
     """Base class for visualization figures"""
 
     name: str = ""  # Unique identifier for the figure
     title: str = ""  # Display title for the figure
+    webgl_threshold: int = 10_000  # Points above which traces render with WebGL
+    max_points: Optional[int] = None  # Points kept per line trace, None keeps all
 
     def __init__(self, results: BacktestResult):
         """Initialize base figure
@@ -20,7 +40,7 @@ class BaseFigure(ABC):
         self._fig = self._create_base_figure()
 
     @abstractmethod
-    def create(self) -> go.Figure:
+    def create(self) -> "go.Figure":
         """Create the figure
 
         This method must be implemented by subclasses to create
@@ -31,31 +51,70 @@ class BaseFigure(ABC):
         """
         pass
 
-    def _create_base_figure(self) -> go.Figure:
+    @property
+    def _scatter(self) -> type:
+        """Get the scatter trace type suited to the funding curve length
+
+        SVG rendering slows down sharply for long series, so WebGL traces
+        are used once the curve exceeds ``webgl_threshold`` points.
+
+        Returns:
+            go.Scattergl for long curves, otherwise go.Scatter
+        """
+        import plotly.graph_objects as go
+
+        if self.funding_curve.height > self.webgl_threshold:
+            return go.Scattergl
+        return go.Scatter
+
+    def _downsample(
+        self, time: pl.Series, values: np.ndarray
+    ) -> Tuple[pl.Series, np.ndarray]:
+        """Reduce a line trace to at most ``max_points`` points
+
+        The series is split into equal buckets and each bucket keeps its
+        minimum and maximum, so peaks and troughs stay visible while the
+        browser draws far fewer points. The first and last points are always
+        kept, so up to four points remain for smaller ``max_points``.
+
+        Args:
+            time: Series of timestamps
+            values: Array of values aligned with time
+
+        Returns:
+            Tuple of (timestamps, values) of the kept points
+        """
+        n = values.shape[0]
+        if self.max_points is None or n <= self.max_points:
+            return time, values
+
+        buckets = max((self.max_points - 2) // 2, 1)
+        size = -(-n // buckets)
+        rows = -(-n // size)
+
+        # Pad the last bucket so that padding is never picked
+        lows = np.full(rows * size, np.inf)
+        lows[:n] = values
+        highs = np.full(rows * size, -np.inf)
+        highs[:n] = values
+        offsets = np.arange(rows) * size
+        indices = np.unique(
+            np.concatenate(
+                (
+                    [0, n - 1],
+                    offsets + lows.reshape(rows, size).argmin(axis=1),
+                    offsets + highs.reshape(rows, size).argmax(axis=1),
+                )
+            )
+        )
+        return time.gather(indices), values[indices]
+
+    def _create_base_figure(self) -> "go.Figure":
         """Create base figure object with common settings
 
         Returns:
             Plotly figure object with default layout settings
         """
-        fig = go.Figure()
-        fig.update_layout(
-            title=self.title,
-            showlegend=True,
-            hovermode="x unified",
-            plot_bgcolor="white",
-            hoverlabel=dict(
-                bgcolor="white", font_size=12, font_family="Microsoft YaHei"
-            ),
-            xaxis=dict(
-                showgrid=True,
-                gridwidth=1,
-                gridcolor="rgba(128,128,128,0.2)",
-                rangeslider=dict(visible=False),
-            ),
-            yaxis=dict(
-                showgrid=True,
-                gridwidth=1,
-                gridcolor="rgba(128,128,128,0.2)",
-            ),
-        )
-        return fig
+        import plotly.graph_objects as go
+
+        return go.Figure(layout=dict(_BASE_LAYOUT, title=self.title))
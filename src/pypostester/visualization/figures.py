@@ -1,7 +1,11 @@
-import plotly.graph_objects as go
+from typing import TYPE_CHECKING, Tuple
+import numpy as np
 import polars as pl
 from pypostester.visualization.base import BaseFigure
 
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
 
 class FundingCurveFigure(BaseFigure):
     """Funding curve visualization figure"""
@@ -9,17 +13,26 @@ class FundingCurveFigure(BaseFigure):
     name = "funding_curve"  # Unique identifier for the figure
     title = "Funding Curve"  # Display title for the figure
 
-    def create(self) -> go.Figure:
+    def create(self) -> "go.Figure":
         """Create funding curve figure
 
         Returns:
             Plotly figure object containing funding curve visualization
         """
-        # Add funding curve trace
+        # Resolve the plotted columns once; plotted values are single
+        # precision, which halves the embedded arrays without any visible
+        # change, while drawdown bounds come from the float64 series
+        time = self.funding_curve.get_column("time")
+        nav = self.funding_curve.get_column("funding_curve").to_numpy()
+        nav = nav.astype(np.float32)
+
+        # Add funding curve trace; the drawdown region below keeps full
+        # resolution
+        trace_time, trace_nav = self._downsample(time, nav)
         self._fig.add_trace(
-            go.Scatter(
-                x=self.funding_curve.get_column("time"),
-                y=self.funding_curve.get_column("funding_curve"),
+            self._scatter(
+                x=trace_time,
+                y=trace_nav,
                 name="NAV",
                 line=dict(color="#1f77b4"),
             )
@@ -27,11 +40,8 @@ class FundingCurveFigure(BaseFigure):
 
         # Check if max drawdown is available and add visualization
         if "max_drawdown" in self.results.indicator_values:
-            cummax = self.funding_curve.get_column("funding_curve").cum_max()
-            drawdown = (
-                self.funding_curve.get_column("funding_curve") - cummax
-            ) / cummax
-            self._add_max_drawdown_visualization(self._fig, cummax, drawdown)
+            cummax, drawdown = self.results.drawdown_series
+            self._add_max_drawdown_visualization(self._fig, time, nav, cummax, drawdown)
         else:
             print("max_drawdown not found in indicators")  # Debug information
 
@@ -40,61 +50,72 @@ class FundingCurveFigure(BaseFigure):
         return self._fig
 
     def _add_max_drawdown_visualization(
-        self, fig: go.Figure, cummax: pl.Series, drawdown: pl.Series
+        self,
+        fig: "go.Figure",
+        time: pl.Series,
+        nav: np.ndarray,
+        cummax: pl.Series,
+        drawdown: pl.Series,
     ) -> None:
         """Add maximum drawdown visualization
 
         Args:
             fig: Plotly figure object
+            time: Series of timestamps of the funding curve
+            nav: Array of funding curve values
             cummax: Series of historical maximum values of the funding curve
             drawdown: Series of drawdown values
         """
+        import plotly.graph_objects as go
+
         # Find start and end points of maximum drawdown
         max_dd_end_idx = drawdown.arg_min()
-        max_dd_start_idx = (
-            self.funding_curve.slice(0, max_dd_end_idx + 1)
-            .get_column("funding_curve")
-            .arg_max()
-        )
-
-        # Get data for drawdown region
-        dd_region = self.funding_curve.slice(
+        # The running maximum is non-decreasing, so the peak is the first
+        # point where it reaches its value at the trough
+        max_dd_start_idx = cummax.search_sorted(cummax[max_dd_end_idx], side="left")
+
+        # Get data for drawdown region; NumPy slices are views and are
+        # serialized by Plotly without another conversion
+        region = slice(max_dd_start_idx, max_dd_end_idx + 1)
+        region_time = time.slice(
             max_dd_start_idx, max_dd_end_idx - max_dd_start_idx + 1
         )
 
-        # Add drawdown region trace
-        fig.add_trace(
-            go.Scatter(
-                x=dd_region.get_column("time"),
-                y=dd_region.get_column("funding_curve"),
+        # Build the region, its fill and the peak and trough markers, then
+        # add them to the figure in one call
+        traces = [
+            self._scatter(
+                x=region_time,
+                y=nav[region],
                 name=f'Max Drawdown Period ({self.results.indicator_values["max_drawdown"]:.1%})',
                 line=dict(color="rgba(255,0,0,0.5)"),
                 showlegend=True,
-            )
-        )
-
-        # Add fill area for drawdown
-        fig.add_trace(
-            go.Scatter(
-                x=dd_region.get_column("time"),
-                y=cummax.slice(max_dd_start_idx, max_dd_end_idx - max_dd_start_idx + 1),
+            ),
+            # Fill area for drawdown
+            self._scatter(
+                x=region_time,
+                y=cummax.to_numpy()[region].astype(np.float32),
                 fill="tonexty",
                 mode="none",
                 fillcolor="rgba(255,0,0,0.2)",
                 showlegend=False,
                 hoverinfo="skip",
-            )
-        )
-
-        # Add markers for start and end of maximum drawdown
-        for idx, name, color, symbol, position in [
-            (max_dd_start_idx, "Peak", "green", "triangle-up", "top"),
-            (max_dd_end_idx, "Trough", "red", "triangle-down", "bottom"),
-        ]:
-            point_value = self.funding_curve.row(idx)[1]  # funding_curve value
-            fig.add_trace(
+            ),
+        ]
+
+        # Markers for start and end of maximum drawdown; both (time,
+        # funding_curve) rows are gathered in one call
+        points = self.funding_curve[[max_dd_start_idx, max_dd_end_idx]].rows()
+        for (point_time, point_value), (name, color, symbol, position) in zip(
+            points,
+            [
+                ("Peak", "green", "triangle-up", "top"),
+                ("Trough", "red", "triangle-down", "bottom"),
+            ],
+        ):
+            traces.append(
                 go.Scatter(
-                    x=[self.funding_curve.row(idx)[0]],  # time value
+                    x=[point_time],
                     y=[point_value],
                     mode="markers+text",
                     name=name,
@@ -104,6 +125,8 @@ class FundingCurveFigure(BaseFigure):
                 )
             )
 
+        fig.add_traces(traces)
+
 
 class MonthlyReturnsFigure(BaseFigure):
     """Monthly returns distribution figure"""
@@ -111,35 +134,23 @@ class MonthlyReturnsFigure(BaseFigure):
     name = "monthly_returns"  # Unique identifier for the figure
     title = "Monthly Returns Distribution"  # Display title for the figure
 
-    def create(self) -> go.Figure:
+    def create(self) -> "go.Figure":
         """Create monthly returns distribution figure
 
         Returns:
             Plotly figure object containing monthly returns distribution visualization
         """
-        # Calculate monthly returns
-        monthly_returns = (
-            self.funding_curve.with_columns(
-                [
-                    pl.col("funding_curve").pct_change().alias("returns"),
-                    pl.col("time").dt.strftime("%Y-%m").alias("month"),
-                ]
-            )
-            .group_by("month")
-            .agg(pl.col("returns").sum())
-            .sort("month")
-        )
+        import plotly.graph_objects as go
+
+        months, returns = self._monthly_returns()
 
         # Add bar trace for monthly returns
         self._fig.add_trace(
             go.Bar(
-                x=monthly_returns.get_column("month"),
-                y=monthly_returns.get_column("returns"),
+                x=months,
+                y=returns,
                 name="Monthly Returns",
-                marker_color=[
-                    "red" if x < 0 else "green"
-                    for x in monthly_returns.get_column("returns")
-                ],
+                marker_color=np.where(returns < 0, "red", "green"),
             )
         )
 
@@ -151,3 +162,38 @@ class MonthlyReturnsFigure(BaseFigure):
             ),
         )
         return self._fig
+
+    def _monthly_returns(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Sum period returns of the funding curve by calendar month
+
+        The funding curve is sorted by time, so each month is a contiguous
+        run and the sums are a single segmented reduction.
+
+        Returns:
+            Tuple of (month labels formatted as YYYY-MM, summed returns)
+        """
+        time = self.funding_curve.get_column("time")
+        curve = self.funding_curve.get_column("funding_curve").to_numpy()
+        if curve.size == 0:
+            return np.array([], dtype=str), np.array([], dtype=np.float64)
+
+        # Months since the epoch, matching the datetime64[M] encoding
+        month_id = (
+            (time.dt.year().cast(pl.Int64) - 1970) * 12 + time.dt.month() - 1
+        ).to_numpy()
+
+        returns = np.empty_like(curve)
+        returns[0] = 0.0
+        np.divide(curve[1:], curve[:-1], out=returns[1:])
+        returns[1:] -= 1.0
+
+        starts = np.flatnonzero(np.r_[True, month_id[1:] != month_id[:-1]])
+        sums = np.add.reduceat(returns, starts)
+        labels = np.datetime_as_string(
+            month_id[starts].astype("datetime64[M]"), unit="M"
+        )
+        return labels, sums
+
+
+# Built-in figures in registration order, which is the report order
+BUILTIN_FIGURES = (FundingCurveFigure, MonthlyReturnsFigure)
@@ -1,8 +1,6 @@
-from typing import Type, Dict
-from pypostester.visualization.figures import BaseFigure
+from typing import Type, Dict, ItemsView
 from pypostester.visualization.base import BaseFigure
 from pypostester.visualization import figures
-import inspect
 
 __all__ = ["figure_registry"]
 
@@ -52,22 +50,18 @@ class FigureRegistry:
         """
         return list(self._registry.keys())
 
-    def _load_built_in_figures(self) -> None:
-        """Automatically load built-in figures
+    def registered_items(self) -> ItemsView[str, Type[BaseFigure]]:
+        """Get the registered figure names and classes
 
-        This method scans the figures module and registers all classes
-        that inherit from BaseFigure (excluding BaseFigure itself)
+        Returns:
+            Live view of (figure name, figure class) pairs in registration order
         """
-        # Get all members from figures module
-        for name, obj in inspect.getmembers(figures):
-            # Check if it's a class and inherits from BaseFigure
-            if (
-                inspect.isclass(obj)
-                and issubclass(obj, BaseFigure)
-                and obj != BaseFigure
-                and hasattr(obj, "name")
-            ):
-                self.register(obj)
+        return self._registry.items()
+
+    def _load_built_in_figures(self) -> None:
+        """Register all built-in figures listed in the figures module"""
+        for figure_cls in figures.BUILTIN_FIGURES:
+            self.register(figure_cls)
 
 
 # Global figure registry instance
@@ -1,14 +1,181 @@
-from typing import Dict, Optional, List
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, Optional, List, Tuple, Type, Union
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from bisect import bisect_right
 from pypostester.models.models import BacktestResult
 from pypostester.visualization.base import BaseFigure
 from pypostester.visualization.registry import figure_registry
+from pypostester.utils.validation import ValidationError, validate_max_workers
 import polars as pl
+import atexit
 import tempfile
 import webbrowser
 import time
 import os
+import re
+import uuid
+
+# Template placeholders of the form $name
+_PLACEHOLDER_PATTERN = re.compile(r"\$([_a-zA-Z][_a-zA-Z0-9]*)")
+
+# Buffer size for writing reports, which can hold large figure payloads
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Upper bounds in minutes of the data frequency units below: 1 hour, 1 day,
+# 1 week and 1 month
+_FREQUENCY_THRESHOLDS = (60, 1440, 10080, 43200)
+
+# (minutes per unit, format spec, unit suffix) for each frequency bucket
+_FREQUENCY_UNITS = (
+    (1, ".0f", "min"),
+    (60, ".1f", "h"),
+    (1440, ".1f", "d"),
+    (10080, ".1f", "w"),
+    (43200, ".1f", "m"),
+)
+
+# Split report templates keyed by path, stored with the modification time in ns
+_TEMPLATE_CACHE: Dict[str, Tuple[int, Tuple[str, ...]]] = {}
+
+# HTML block for a single metric card
+_METRIC_CARD_TEMPLATE = """
+            <div class="metric-card">
+                <div class="metric-value">{value}</div>
+                <div class="metric-name">{name}</div>
+            </div>
+            """
+
+# HTML line for a single labelled info item
+_INFO_ITEM_TEMPLATE = (
+    '<div class="info-item"><span style="color: #666;">{}:</span> {}</div>'
+)
+
+
+def _info_items_html(items: Dict[str, str]) -> str:
+    """Render labelled info items, one per line
+
+    Args:
+        items: Mapping of labels to display values
+
+    Returns:
+        HTML string containing one info item per entry
+    """
+    # str.join builds a list from any iterable, so pass one directly
+    return "\n".join([_INFO_ITEM_TEMPLATE.format(k, v) for k, v in items.items()])
+
+
+def _load_template(path: Path) -> Tuple[str, ...]:
+    """Read and split a report template, reusing it while the file is unchanged
+
+    Args:
+        path: Path to the HTML template file
+
+    Returns:
+        Literal template chunks with the placeholder names at the odd positions
+    """
+    key = str(path)
+    mtime = os.stat(path).st_mtime_ns
+    entry = _TEMPLATE_CACHE.get(key)
+    if entry is not None and entry[0] == mtime:
+        return entry[1]
+    with open(path, "r", encoding="utf-8") as f:
+        chunks = tuple(_PLACEHOLDER_PATTERN.split(f.read()))
+    # Replace any stale entry so edits never leave old versions behind
+    _TEMPLATE_CACHE[key] = (mtime, chunks)
+    return chunks
+
+
+def _remove_temporary_file(path: Path) -> None:
+    """Remove a temporary report file, warning if it cannot be removed
+
+    Args:
+        path: Path of the temporary file
+    """
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Warning: Failed to clean up temporary file: {e}")
+
+
+def _plotly_js_html(include_plotlyjs: str) -> str:
+    """Render the script tag that loads plotly.js for the report
+
+    Args:
+        include_plotlyjs: "cdn" to reference the plotly.js version matching the
+            installed plotly from its CDN, or "inline" to embed it
+
+    Returns:
+        HTML script tag loading plotly.js
+
+    Raises:
+        ValueError: If include_plotlyjs is not "cdn" or "inline"
+    """
+    import plotly.offline as po
+
+    if include_plotlyjs == "cdn":
+        return (
+            '<script charset="utf-8" src="https://cdn.plot.ly/'
+            f'plotly-{po.get_plotlyjs_version()}.min.js"></script>'
+        )
+    if include_plotlyjs == "inline":
+        return f'<script type="text/javascript">{po.get_plotlyjs()}</script>'
+    raise ValueError("include_plotlyjs must be 'cdn' or 'inline'")
+
+
+@lru_cache(maxsize=None)
+def _display_name(key: str) -> str:
+    """Convert an underscore-separated key to a title case display name
+
+    Args:
+        key: Indicator name such as "max_drawdown"
+
+    Returns:
+        Display name such as "Max Drawdown"
+    """
+    return " ".join(word.capitalize() for word in key.split("_"))
+
+
+class _LazyFigures(MutableMapping):
+    """Figures keyed by name, instantiated from their class on first access
+
+    Entries may be set to a figure instance or to a figure class; a class is
+    replaced by its instance the first time the entry is read.
+    """
+
+    def __init__(self, results: BacktestResult):
+        """Initialize an empty figure mapping
+
+        Args:
+            results: BacktestResult object passed to instantiated figures
+        """
+        self._results = results
+        self._entries: Dict[str, Union[BaseFigure, Type[BaseFigure]]] = {}
+
+    def __getitem__(self, name: str) -> BaseFigure:
+        entry = self._entries[name]
+        if isinstance(entry, type):
+            entry = self._entries[name] = entry(self._results)
+        return entry
+
+    def __setitem__(self, name: str, figure: Union[BaseFigure, Type[BaseFigure]]):
+        self._entries[name] = figure
+
+    def __delitem__(self, name: str) -> None:
+        del self._entries[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._entries!r})"
 
 
 class BacktestVisualizer:
@@ -20,6 +187,7 @@ class BacktestVisualizer:
         params: Dict,
         template_path: Optional[Path] = None,
         figures: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
     ):
         """Initialize visualizer
 
@@ -29,7 +197,18 @@ class BacktestVisualizer:
             template_path: Path to HTML template file
             figures: List of figure names to display. If empty list, no figures will be shown.
                     If None, all registered figures will be shown.
+            max_workers: Number of threads used to render figures. If None,
+                    figures are rendered sequentially.
+
+        Raises:
+            ValueError: If max_workers is invalid
         """
+        try:
+            validate_max_workers(max_workers)
+        except ValidationError as e:
+            raise ValueError(f"Invalid input: {str(e)}")
+
+        self.max_workers = max_workers
         self.results = results
         self.params = params
         self._template_path = template_path or (
@@ -39,20 +218,18 @@ class BacktestVisualizer:
             / "report_template.html"
         )
 
-        # Initialize figure dictionaries
-        self.figures: Dict[str, BaseFigure] = {}
+        # Figure classes are resolved here so unknown names fail early, but
+        # figures are only instantiated once they are accessed or rendered
+        self.figures: MutableMapping[str, BaseFigure] = _LazyFigures(results)
         self._custom_figures: List[BaseFigure] = []
 
         # Add specified figures
         if figures is not None:  # figures parameter explicitly specified
             if figures:  # if figures is not an empty list
                 for name in figures:
-                    figure_cls = figure_registry.get(name)
-                    self.figures[name] = figure_cls(results)
+                    self.figures[name] = figure_registry.get(name)
         else:  # figures is None, show all registered figures
-            for name in figure_registry.available_figures:
-                figure_cls = figure_registry.get(name)
-                self.figures[name] = figure_cls(results)
+            self.figures.update(figure_registry.registered_items())
 
     def add_figure(self, figure: BaseFigure) -> None:
         """Add custom figure
@@ -73,29 +250,72 @@ class BacktestVisualizer:
         Returns:
             Dictionary mapping figure names to their HTML representations
         """
-        figures_html = {}
+        return dict(self._iter_figures_html())
 
-        # Generate built-in figures
-        for name, figure in self.figures.items():
-            figure_html = f"""
-            <div class="chart">
-                <h3>{figure.title}</h3>
-                {figure.create().to_html(full_html=False, include_plotlyjs=False)}
-            </div>
-            """
-            figures_html[name] = figure_html
+    def _iter_figures_html(self) -> Iterator[Tuple[str, str]]:
+        """Render figures one at a time in report order
+
+        When rendering sequentially each figure is only created once it is
+        requested, so a consumer writing them out holds one at a time.
 
-        # Generate custom figures
+        Yields:
+            Tuples of (figure name, figure HTML)
+        """
+        # Built-in figures come first; a custom figure with the same name
+        # replaces the built-in one in place, which is then never instantiated
+        figures: Dict[str, Optional[BaseFigure]] = dict.fromkeys(self.figures)
         for figure in self._custom_figures:
-            figure_html = f"""
+            figures[figure.name] = figure
+        instances = (figure or self.figures[name] for name, figure in figures.items())
+
+        if self.max_workers is None or self.max_workers <= 1:
+            for name, figure in zip(figures, instances):
+                yield name, self._render_figure(figure)
+        else:
+            # Figures are independent, so they can be rendered concurrently
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                yield from zip(figures, pool.map(self._render_figure, instances))
+
+    @staticmethod
+    def _render_figure(figure: BaseFigure) -> str:
+        """Create a figure and render it as an HTML chart block
+
+        The figure is serialized to compact JSON and drawn by a single
+        Plotly.newPlot call, using the plotly.js loaded once by the template.
+        Animation frames are added and played afterwards, as Plotly's own
+        HTML output does.
+
+        Args:
+            figure: Figure to render
+
+        Returns:
+            HTML string containing the figure title and chart
+        """
+        import plotly.io as pio
+
+        figure_json = pio.to_json(figure.create(), validate=False, pretty=False)
+        # Keep "</script>" inside JSON strings from closing the script tag
+        figure_json = figure_json.replace("</", "<\\/")
+        div_id = f"figure-{uuid.uuid4()}"
+        return f"""
             <div class="chart">
                 <h3>{figure.title}</h3>
-                {figure.create().to_html(full_html=False, include_plotlyjs=False)}
+                <div id="{div_id}" class="plotly-graph-div" style="height:100%; width:100%;"></div>
+                <script>
+                    (function () {{
+                        var figure = {figure_json};
+                        var plot = Plotly.newPlot("{div_id}", figure.data, figure.layout, {{"responsive": true}});
+                        if (figure.frames) {{
+                            plot.then(function () {{
+                                return Plotly.addFrames("{div_id}", figure.frames);
+                            }}).then(function () {{
+                                Plotly.animate("{div_id}", null);
+                            }});
+                        }}
+                    }})();
+                </script>
             </div>
             """
-            figures_html[figure.name] = figure_html
-
-        return figures_html
 
     def _generate_backtest_params_html(self) -> str:
         """Generate HTML for backtest parameters
@@ -113,10 +333,7 @@ class BacktestVisualizer:
             ),
         }
 
-        return "\n".join(
-            f'<div class="info-item"><span style="color: #666;">{k}:</span> {v}</div>'
-            for k, v in params.items()
-        )
+        return _info_items_html(params)
 
     def _generate_data_info_html(self) -> str:
         """Generate HTML for data information
@@ -125,27 +342,22 @@ class BacktestVisualizer:
             HTML string containing formatted data information
         """
         df = self.results.funding_curve
-        start_date = df.select(pl.col("time").min()).item().strftime("%Y-%m-%d")
-        end_date = df.select(pl.col("time").max()).item().strftime("%Y-%m-%d")
-        total_days = (
-            df.select(pl.col("time").max()).item()
-            - df.select(pl.col("time").min()).item()
-        ).days
+        # Collect date range and typical interval in one query
+        start_time, end_time, time_diff = df.select(
+            pl.col("time").min(),
+            pl.col("time").max().alias("end"),
+            pl.col("time").diff().median().alias("interval"),
+        ).row(0)
+        start_date = start_time.strftime("%Y-%m-%d")
+        end_date = end_time.strftime("%Y-%m-%d")
+        total_days = (end_time - start_time).days
 
         # Calculate data frequency
-        time_diff = df.select(pl.col("time").diff().median()).item()
         minutes = time_diff.total_seconds() / 60
-
-        if minutes < 60:  # Less than 1 hour
-            frequency = f"{minutes:.0f}min"
-        elif minutes < 1440:  # Less than 1 day
-            frequency = f"{minutes/60:.1f}h"
-        elif minutes < 10080:  # Less than 1 week
-            frequency = f"{minutes/1440:.1f}d"
-        elif minutes < 43200:  # Less than 1 month
-            frequency = f"{minutes/10080:.1f}w"
-        else:  # Greater than or equal to 1 month
-            frequency = f"{minutes/43200:.1f}m"
+        divisor, spec, unit = _FREQUENCY_UNITS[
+            bisect_right(_FREQUENCY_THRESHOLDS, minutes)
+        ]
+        frequency = f"{minutes / divisor:{spec}}{unit}"
 
         info = {
             "Start Date": start_date,
@@ -155,10 +367,7 @@ class BacktestVisualizer:
             "Data Frequency": frequency,
         }
 
-        return "\n".join(
-            f'<div class="info-item"><span style="color: #666;">{k}:</span> {v}</div>'
-            for k, v in info.items()
-        )
+        return _info_items_html(info)
 
     def _generate_metrics_html(self) -> str:
         """Generate HTML for metrics
@@ -166,80 +375,80 @@ class BacktestVisualizer:
         Returns:
             HTML string containing formatted metrics
         """
-        metrics_html = ""
-
-        # Get formatted metric values from BacktestResult object
-        for key, value in self.results.formatted_indicator_values.items():
-            # Convert underscore-separated keys to title case display names
-            display_name = " ".join(word.capitalize() for word in key.split("_"))
-
-            metrics_html += f"""
-            <div class="metric-card">
-                <div class="metric-value">{value}</div>
-                <div class="metric-name">{display_name}</div>
-            </div>
-            """
-
-        return metrics_html
+        return "".join(
+            [
+                _METRIC_CARD_TEMPLATE.format(value=value, name=_display_name(key))
+                for key, value in self.results.formatted_indicator_values.items()
+            ]
+        )
 
-    def generate_html_report(self, output_path: str) -> None:
+    def generate_html_report(
+        self, output_path: str, include_plotlyjs: str = "cdn"
+    ) -> None:
         """Generate HTML backtest report
 
+        plotly.js is loaded once for the whole report, however many figures
+        it contains.
+
         Args:
             output_path: Path where the HTML report will be saved
-        """
-        # Read HTML template
-        with open(self._template_path, "r", encoding="utf-8") as f:
-            html_template = f.read()
+            include_plotlyjs: "cdn" to load plotly.js from its CDN, or "inline"
+                to embed it so the report also works offline
 
-        # Generate all figure HTML code
-        figures_html = self._generate_all_figures()
+        Raises:
+            ValueError: If include_plotlyjs is not "cdn" or "inline"
+        """
+        plotly_js = _plotly_js_html(include_plotlyjs)
+        chunks = _load_template(self._template_path)
 
         # Prepare template variables
         template_vars = {
+            "plotly_js": plotly_js,
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "backtest_params_html": self._generate_backtest_params_html(),
             "data_info_html": self._generate_data_info_html(),
             "metrics_html": self._generate_metrics_html(),
-            "figures": figures_html,  # Pass figures dictionary directly
         }
 
-        # Replace template variables
-        html_content = html_template
-        for key, value in template_vars.items():
-            if key != "figures":  # Skip direct replacement for figures
-                placeholder = f"${key}"
-                html_content = html_content.replace(placeholder, str(value))
-
-        # Find and replace figures placeholder
-        figures_placeholder = "$figures"
-        if figures_placeholder in html_content:
-            figures_section = "\n".join(html for html in figures_html.values())
-            html_content = html_content.replace(figures_placeholder, figures_section)
-
-        # Save HTML file
-        with open(output_path, "w", encoding="utf-8", errors="xmlcharrefreplace") as f:
-            f.write(html_content)
+        # Stream literal template chunks and substituted values to the file
+        with open(
+            output_path,
+            "w",
+            encoding="utf-8",
+            errors="xmlcharrefreplace",
+            buffering=_WRITE_BUFFER_SIZE,
+        ) as f:
+            for i, chunk in enumerate(chunks):
+                if i % 2 == 0:
+                    f.write(chunk)
+                elif chunk == "figures":
+                    # Figures are rendered as they are written
+                    for j, (_, figure_html) in enumerate(self._iter_figures_html()):
+                        if j:
+                            f.write("\n")
+                        f.write(figure_html)
+                elif chunk in template_vars:
+                    f.write(template_vars[chunk])
+                else:
+                    # Unknown placeholders are left untouched
+                    f.write(f"${chunk}")
 
     def show_in_browser(self, delay: float = 0.5) -> None:
         """Display backtest results in browser
 
+        The report is written to a temporary file that is removed when the
+        interpreter exits, so the browser can load it at its own pace.
+
         Args:
-            delay: Delay in seconds before cleaning up temporary file
+            delay: Delay in seconds to wait after opening the browser, so that
+                a script ending right afterwards does not remove the file first
         """
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".html", encoding="utf-8", delete=False
-        ) as tmp_file:
-            # Generate report and write to temporary file
-            self.generate_html_report(tmp_file.name)
-            # Get temporary file path
+        # Create temporary file; it is closed before the report is written
+        with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as tmp_file:
             tmp_path = Path(tmp_file.name)
-            # Open file in browser
-            webbrowser.open(f"file://{tmp_path.absolute()}")
-
-            time.sleep(delay)
-            try:
-                os.unlink(tmp_path)
-            except Exception as e:
-                print(f"Warning: Failed to clean up temporary file: {e}")
+        atexit.register(_remove_temporary_file, tmp_path)
+
+        # Generate report and open file in browser
+        self.generate_html_report(str(tmp_path))
+        webbrowser.open(f"file://{tmp_path.absolute()}")
+        time.sleep(delay)